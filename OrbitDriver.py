@@ -11,6 +11,7 @@ OrbitDriver is the driver file for the movement of planets.
 import sys
 sys.path.insert(1, 'lib')
 import Model as md
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import Render as rn
@@ -26,32 +27,36 @@ def main():
     #SolarSystemModel
     mySolarSystem = md.SolarSystemModel()
     
-    names = ["Mercury","Venus","Earth","Mars","Comet"]
+    names = np.array([b.name for b in mySolarSystem.bodies])
+    nBodies = len(names)
     
-    # Create a dataframe to store all planet attributes in.
-    df = pd.DataFrame({"planet":[],
-                       "x":[],"y":[],"z":[],
-                       "r":[],"v":[],"e":[]})
+    # Record the state and energy of every planet at each step, the
+    # dataframe columns are computed from these once the simulation is
+    # complete.
+    history = np.empty((steps,nBodies,6))
+    energies = np.empty((steps,nBodies))
 
     # Iterate and advance solar system. Heart of program.
     tNext = []
     for i in range(steps):
         # progress update
-        if i%(steps/10-1) == 0:
-            print(str(10*i/((steps/10)-1))+"%...")
+        if i%max(1,steps//10) == 0:
+            print(f"{100*i//steps}%...")
             
-        tn, bodies = mySolarSystem.advance(dt)     
+        tn, _ = mySolarSystem.advance(dt)
         tNext.append(tn)
-        
-        for j in range(len(bodies)):
-            dTemp = pd.DataFrame({"planet":[names[j]],
-                                   "x":[bodies[j].state[0]],
-                                   "y":[bodies[j].state[1]],
-                                   "z":[bodies[j].state[2]],
-                                   "r":[bodies[j].pos],
-                                   "v":[bodies[j].vel],
-                                   'e':[mySolarSystem.total_energy(names[j])]})
-            df = df.append(dTemp, ignore_index = True) 
+        history[i] = mySolarSystem.states
+        energies[i] = mySolarSystem.total_energies()
+            
+    # Create a dataframe to store all planet attributes in.
+    f = history.reshape(-1,6)
+    planetId = np.tile(np.arange(nBodies),steps)
+    df = pd.DataFrame({"planet":names[planetId],
+                       "planet_id":planetId,
+                       "x":f[:,0],"y":f[:,1],"z":f[:,2],
+                       "r":np.sqrt(f[:,0]**2+f[:,1]**2+f[:,2]**2),
+                       "v":np.sqrt(f[:,3]**2+f[:,4]**2+f[:,5]**2),
+                       "e":energies.ravel()})
             
     # We'll plot only the planets we want 
     # (Earth and Mars)
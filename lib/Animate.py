@@ -20,12 +20,14 @@ class Animate(object):
         Render instance that controls drawing to screen
     screen_size : Int array
         Int array of screen dimensions.
+    throttle : bool
+        Delay every frame by 10 ms, turn off to run as fast as possible.
         
     Returns
     ----------
     None
     """
-    def __init__(self,model,render,ss):
+    def __init__(self,model,render,ss,throttle=True):
         self.model = model
         self.render = render
         self.screen_size = ss
@@ -34,6 +36,7 @@ class Animate(object):
         self.dt = 0
         self.screen = pg.display.set_mode(self.screen_size)
         self.time_scale = (1/3e3) #years per 3e3 ms
+        self.throttle = throttle
     
     def _timing_handler(self):
         """Handle the differences in clock speed we will find across 
@@ -70,10 +73,15 @@ class Animate(object):
                 if event.key == pg.K_ESCAPE:
                     self.done = True 
     
-    def run(self):
+    def run(self,max_steps=None):
         """Handles the initialization and destruction of the pygame window.
         Provides continous animation until an event handler is met.
         
+        Parameters
+        ----------
+        max_steps : int, optional
+            Stop after this many frames even if no event is met.
+        
         Returns
         -------
         None.
@@ -81,6 +89,7 @@ class Animate(object):
         # Initialize pygame and open a window
         pg.init()   
         
+        frames = 0
         while not self.done:   # Some event triggers done
             # Check handlers
             self._timing_handler()
@@ -96,6 +105,11 @@ class Animate(object):
             pg.display.update()
         
             # Loop runs too fast, must throttle it
-            pg.time.delay(10)
+            if self.throttle:
+                pg.time.delay(10)
+            
+            frames += 1
+            if max_steps is not None and frames >= max_steps:
+                self.done = True
         
         pg.quit()
\ No newline at end of file
@@ -5,6 +5,7 @@ This set of classes represents physical objects.  It is primarily a way to
 keep track of the attributes (temperature, position, velocity, etc) of objects
 in the simulator.  They are inteded for use with the  Physics classes.
 """
+import math
 import numpy as np
 
 class ThermalBody(object):
@@ -15,6 +16,7 @@ class ThermalBody(object):
     temperature : float
         The current temperature of the object    
     '''
+    __slots__ = ('temperature',)
     
     def __init__(self,temperature):
         self.temperature = temperature
@@ -46,21 +48,103 @@ class GravBody(object):
         z coordinate for vel.
     m : float
         mass of GravBody.
+    dtype : data-type
+        Float type the position and velocity are stored as.
         
     Returns
     -------
     None.
     """
-    def __init__(self,x,y,z,vx,vy,vz,m):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.vx = vx
-        self.vy = vy
-        self.vz = vz
+    __slots__ = ('f','m','idx','name')
+    
+    def __init__(self,x,y,z,vx,vy,vz,m,dtype=float):
+        # Position and velocity are kept together in a single array. An
+        # OrbitModel rebinds this to a row of its own state array, making
+        # the body a view onto the model.
+        self.f = np.array([x,y,z,vx,vy,vz],dtype=dtype)
         self.m = m
-        self.r = np.sqrt(np.square(x)+np.square(y)+np.square(z))
-        self.v = np.sqrt(np.square(vx)+np.square(vy)+np.square(vz))
+        # Row in the owning model's state array and name in that model,
+        # None until the body is bound to one.
+        self.idx = None
+        self.name = None
+        
+    def bind(self,states,idx):
+        """Make the body a view onto a row of a (N,6) state array.
+
+        Parameters
+        ----------
+        states : (N,6) float array
+            State array of the model owning this body.
+        idx : int
+            Row of states that belongs to this body.
+            
+        Returns
+        -------
+        None.
+        """
+        states[idx] = self.f
+        self.f = states[idx]
+        self.idx = idx
+    
+    @property
+    def x(self):
+        return self.f[0]
+    
+    @x.setter
+    def x(self,val):
+        self.f[0] = val
+        
+    @property
+    def y(self):
+        return self.f[1]
+    
+    @y.setter
+    def y(self,val):
+        self.f[1] = val
+        
+    @property
+    def z(self):
+        return self.f[2]
+    
+    @z.setter
+    def z(self,val):
+        self.f[2] = val
+        
+    @property
+    def vx(self):
+        return self.f[3]
+    
+    @vx.setter
+    def vx(self,val):
+        self.f[3] = val
+        
+    @property
+    def vy(self):
+        return self.f[4]
+    
+    @vy.setter
+    def vy(self,val):
+        self.f[4] = val
+        
+    @property
+    def vz(self):
+        return self.f[5]
+    
+    @vz.setter
+    def vz(self,val):
+        self.f[5] = val
+        
+    @property
+    def r(self):
+        """Returns the distance from the origin"""
+        f = self.f
+        return math.sqrt(f[0]*f[0]+f[1]*f[1]+f[2]*f[2])
+    
+    @property
+    def v(self):
+        """Returns the speed"""
+        f = self.f
+        return math.sqrt(f[3]*f[3]+f[4]*f[4]+f[5]*f[5])
     
     @property
     def pos(self):
@@ -79,10 +163,10 @@ class GravBody(object):
 
         Returns
         -------
-        List
-            Contains 7 floats describing pos and motion of body.
+        Float array
+            Contains 6 floats describing pos and motion of body.
         """
-        return [self.x, self.y, self.z, self.vx, self.vy, self.vz, self.m]
+        return self.f
     
     @state.setter
     def state(self,f):
@@ -90,22 +174,14 @@ class GravBody(object):
 
         Parameters
         ----------
-        f : list
+        f : float array
             Contains info to set the state of the planet.
             
         Returns
         -------
         None.
         """
-        self.x = f[0]
-        self.y = f[1]
-        self.z = f[2]
-        self.vx = f[3]
-        self.vy = f[4]
-        self.vz = f[5]
-        self.m = f[6]
-        self.r = np.sqrt(np.square(f[0])+np.square(f[1])+np.square(f[2])) 
-        self.v = np.sqrt(np.square(f[3])+np.square(f[4])+np.square(f[5])) 
+        self.f[:] = f
         
     def __str__(self):
         """Output the GravBody in an easy to read format.
@@ -128,6 +204,7 @@ class PopulationBody(object):
     P : float
         The current population of the object    
     """
+    __slots__ = ('P',)
     
     def __init__(self,P):
         self.P = P
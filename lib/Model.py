@@ -52,38 +52,65 @@ class OrbitModel(Model):
         Solar mass of each object
     names : list of strings
         Names for each object
+    dtype : data-type
+        Float type of the state and mass arrays. float32 halves their size
+        at the cost of precision.
     """    
-    def __init__(self,aList,eList,masses,names):
-        # Create list of bodies and associated dictionary.
+    def __init__(self,aList,eList,masses,names,dtype=float):
+        aList = np.asarray(aList,dtype=float)
+        eList = np.asarray(eList,dtype=float)
+        
+        # Gravity constants, the same for every body.
+        G = 4*np.pi**2
+        gravParam = G*1 # One solar mass for mass of sun.
+        
+        # Store the state of every body as a row of a single array and the
+        # masses alongside it. Each planet starts at perihelion with the
+        # entire magnitude of its velocity in the y direction.
+        self.states = np.zeros((len(aList),6),dtype=dtype)
+        self.states[:,0] = aList*(1-eList)
+        self.states[:,4] = np.sqrt(gravParam*(1+eList)/((1-eList)*aList))
+        self.masses = np.array(masses,dtype=dtype)
+        
+        # Create list of bodies, each a view onto its row, and associated
+        # dictionary.
         bodies = []
         dic = {}
-        for i in range(len(aList)):            
-            # Get constants from instantiated grav class.
-            G = 4*np.pi**2
-            gravParam = G*1 # One solar mass for mass of sun.
-            parahelionDist = aList[i]*(1-eList[i]) 
-            
-            # Calculate velocity (entire magnitude in y direction) at
-            # perihelion distance. This is where planet will start.
-            weirdTerm = (1+eList[i])/(1-eList[i])
-            yVel = np.sqrt(gravParam*1*weirdTerm/aList[i])
-
-            # Create the new body.
-            newBody = bd.GravBody(parahelionDist, 0.0, 0.0, 0.0, yVel, 0.0, masses[i])
+        for i in range(len(aList)):
+            newBody = bd.GravBody(*self.states[i],self.masses[i],dtype=dtype)
+            newBody.bind(self.states,i)
+            newBody.name = names[i]
             bodies.append(newBody)
             dic[names[i]] = newBody
             
-        # Instantiate a CentralGravity class for specific orbit.            
-        RK4 = slv.RK4()  
+        # Instantiate a CentralGravity class for specific orbit, the
+        # symplectic leapfrog keeps the orbits closed.
+        leapfrog = slv.Leapfrog()  
         # Dynamic Gravity Solver
-        grav = phys.CentralGravity(RK4)
+        grav = phys.CentralGravity(leapfrog)
         
         # Set the dictionary for the instance (names) and push all init
-        # info to the super class, which has the advance function we want
-        # to use.
+        # info to the super class.
         self.dic = dic
         super().__init__(grav,bodies)
         
+    def advance(self,t):
+        """ Advance all of the bodies in the model by one timestep at once.
+
+        Parameters
+        ----------
+        t : float
+            Time to advance the model to.
+        
+        Returns
+        -------
+        Float of time after advance, updated list of bodies.
+        """
+        self.time, self.states = self.physics.advance_batch(self.time,
+                                                            self.states,
+                                                            self.masses,t)
+        return self.time, self.bodies
+        
     def get_body(self,name):
         """Returns a body for a specified planet name.
 
@@ -111,23 +138,41 @@ class OrbitModel(Model):
         Tot energy of planet (U and KE).
         """
         p = self.get_body(name)
-        pMass = p.state[6]
+        pMass = p.m
         rad = p.pos
         v = p.vel
-        GM = 4*np.pi**2
-        pot = GM*pMass/rad
+        GM = self.physics.k
+        pot = -GM*pMass/rad
         ke = 0.5*pMass*v**2
         return pot+ke
     
+    def total_energies(self):
+        """Returns the total energy of every body at once.
+
+        Returns
+        -------
+        Float array of the tot energy (U and KE) of each body, in the same
+        order as bodies.
+        """
+        f = self.states
+        r = np.sqrt(f[:,0]*f[:,0]+f[:,1]*f[:,1]+f[:,2]*f[:,2])
+        v2 = f[:,3]*f[:,3]+f[:,4]*f[:,4]+f[:,5]*f[:,5]
+        return -self.physics.k*self.masses/r + 0.5*self.masses*v2
+    
 class SolarSystemModel(OrbitModel):
     """Represents and instance of an OrbitModel 
     object with the bodies (planets): Mercury, Venus, Earth, Mars, Comet.
     
+    Attributes
+    ----------
+    dtype : data-type
+        Float type of the state and mass arrays.
+    
     Returns
     -------
     None.
     """
-    def __init__(self):
+    def __init__(self,dtype=float):
         # Planet names
         names = ["Mercury","Venus","Earth","Mars","Comet"]
         # List of semi-major axis
@@ -138,13 +183,7 @@ class SolarSystemModel(OrbitModel):
         nonadjust = [0.17, 2.44, 3.00, 0.32, 1]
         masses = [element * (10**(-6)) for element in nonadjust]
         
-        super().__init__(aList, eList, masses, names)
-        
-        self.mercury = self.get_body("Mercury")
-        self.venus = self.get_body("Venus")
-        self.earth = self.get_body("Earth")
-        self.mars = self.get_body("Mars")
-        self.comet = self.get_body("Comet")
+        super().__init__(aList, eList, masses, names, dtype=dtype)
 
 class EnragedAvian(Model):
     """Takes in list of semi major axis, eccentricities, initiates a
@@ -5,8 +5,10 @@ This set of classes implements various differential equations that represent
 different physical environments.  They are intended for use with the
 differential equation solving classes derived from Solver.
 """
+import math
 import numpy as np
 import Vector
+import Solver as slv
 
 class Physics():
     """Base class for Physics objects.
@@ -16,12 +18,17 @@ class Physics():
     solver : Solver
         An instance of a class derived from Solver to solve the differential
         equation
+    dt_max : float
+        Longest substep advance may take
+    dt_min : float
+        Shortest substep advance may take, whatever max_step returns
 
     """
-    def __init__(self,solver,dt_max=0.001):
+    def __init__(self,solver,dt_max=0.001,dt_min=1e-9):
         """To be extended by Physics subclass"""
         self.solver = solver
         self.dt_max = dt_max
+        self.dt_min = dt_min
         
     def advance(self,t,body,dt):
         """Advance the body one time step
@@ -48,17 +55,121 @@ class Physics():
             The new time
         body : Body
             The body advanced one time step
+            
+        Raises
+        ------
+        ValueError
+            If dt or the state is not finite, which would otherwise keep
+            the substep loop from ending.
         """
-        while np.abs(dt) > 0:
-            if np.abs(dt) > self.dt_max:
-                step = self.dt_max*np.sign(dt)
+        if not math.isfinite(dt):
+            raise ValueError("dt is not finite")
+        while dt != 0:
+            dt_max = self.max_step(body.state)
+            # Written so that a NaN also fails the test.
+            if not dt_max >= self.dt_min:
+                if math.isnan(dt_max):
+                    raise ValueError("state is not finite")
+                dt_max = self.dt_min
+            if abs(dt) > dt_max:
+                step = dt_max if dt > 0 else -dt_max
             else:
                 step = dt
-            t, body.state = self.solver.advance(t,body.state,step)
+            t, body.state = self.step(t,body.state,step)
             dt = dt - step
         return t, body
+    
+    def advance_batch(self,t,states,masses,dt):
+        """Advance a batch of bodies one time step
+
+        The bodies are stored as the rows of a single state array, which is
+        updated in place so that every body viewing a row sees the change.
+
+        Parameters
+        ----------
+        t : float
+            The current time
+            
+        states : (N,6) float array
+            The state of each body, one body per row
+            
+        masses : (N,) float array
+            The mass of each body
+            
+        dt : float
+            The amount of time to advance. (the time step)
+
+        Returns
+        -------
+        time : float
+            The new time
+        states : (N,6) float array
+            The states advanced one time step
+            
+        Raises
+        ------
+        ValueError
+            If dt or any state is not finite, see advance.
+        """
+        if not math.isfinite(dt):
+            raise ValueError("dt is not finite")
+        # Each body takes its own substeps, so keep track of the time each
+        # one has left to advance. Bodies that are done take steps of zero.
+        remaining = np.full((len(states),1),float(dt))
+        while remaining.any():
+            dt_max = self.max_step(states)
+            if np.isnan(dt_max).any():
+                raise ValueError("state is not finite")
+            dt_max = np.reshape(np.maximum(dt_max,self.dt_min),(-1,1))
+            step = np.clip(remaining,-dt_max,dt_max)
+            _, fnext = self.step(t+dt-remaining,states,step)
+            states[:] = fnext
+            remaining -= step
+        return t+dt, states
+    
+    def step(self,t,f,dt):
+        """Take a single substep of the solver
 
-    def diff_eq(self,t,T):
+        Parameters
+        ----------
+        t : float
+            The current time
+            
+        f : float array
+            The current state, or a (N,6) array of states from
+            advance_batch.
+            
+        dt : float or (N,1) float array
+            The substep, one per row of f if given a batch
+
+        Returns
+        -------
+        time : float
+            The new time
+        fnext : float array
+            The state after the substep
+        """
+        return self.solver.advance(t,f,dt)
+    
+    def max_step(self,f):
+        """Largest substep advance may take from state f
+
+        Parameters
+        ----------
+        f : float array
+            The current state, or a (N,6) array of states from
+            advance_batch.
+
+        Returns
+        -------
+        dt_max : float or (N,) float array
+            The largest substep, one per row of f if given a batch. advance
+            never steps less than dt_min, and takes NaN to mean the state
+            is not finite.
+        """
+        return self.dt_max
+
+    def diff_eq(self,t,T,out=None):
         """The cooling differential equation
 
         This diff_eq implementation in the Physics base class is a stub.
@@ -73,6 +184,10 @@ class Physics():
 
         t : float
             The current time
+            
+        out : float array, optional
+            Array the slope may be written to. Implementations are free to
+            ignore it, callers always use the returned slope.
 
         Returns
         -------
@@ -107,7 +222,7 @@ class Cooling(Physics):
         # Solver's physics instance is this instance of physics (cooling).
         self.solver.physics = self
         
-    def diff_eq(self,t,T):
+    def diff_eq(self,t,T,out=None):
         """See class Physics for full docstring"""
         k = self.k
         Ta = self.Ta
@@ -128,38 +243,120 @@ class CentralGravity(Physics):
         time in years.
     planetMass : float
         Mass of planet in solar masses.
+    eta : float
+        Substeps are limited to eta*r/v, short close to the central mass
+        where the orbit moves fast and long far away from it, and to dt_max.
     """
     
-    def __init__(self,solver,planetMass=1,gravConstant=(4*np.pi**2)):
+    def __init__(self,solver,planetMass=1,gravConstant=(4*np.pi**2),
+                 eta=0.01,dt_max=0.01):
         self.solver = solver
         self.G = gravConstant
         self.M = planetMass
-        super().__init__(solver)
+        # Gravity parameter of the central mass, used by every evaluation.
+        self.k = gravConstant*planetMass
+        self.neg_k = -self.k
+        self.eta = eta
+        super().__init__(solver,dt_max)
     
         # I am who i am physics thinks they are... Jk
         # Solver's physics instance is this instance of physics 
         # (CentralGravity).
         self.solver.physics = self
         
-    def diff_eq(self,t,f):
-        """See class Physics for full docstring, Computes diff eq for 6 eq."""
-        # Radius vector to 3/2 power (denom of each diff eq).
-        rad = (f[0]**2+f[1]**2+f[2]**2)**(3/2)
+    def _compiled(self,solverClass):
+        """True if a compiled kernel can stand in for this physics and
+        solver. The kernels inline diff_eq and max_step, so subclasses
+        overriding either, or solvers other than solverClass itself, take
+        the general path."""
+        return (slv.HAVE_NUMBA and type(self.solver) is solverClass
+                and type(self).diff_eq is CentralGravity.diff_eq
+                and type(self).max_step is CentralGravity.max_step)
+        
+    def advance_batch(self,t,states,masses,dt):
+        """See class Physics for full docstring
+        
+        With numba installed and a Leapfrog solver, the whole substep loop
+        runs in a single compiled call.
+        """
+        if self._compiled(slv.Leapfrog):
+            slv.leapfrog_central_advance(states,self.k,float(dt),self.eta,
+                                         self.dt_max,self.dt_min)
+            return t+dt, states
+        return super().advance_batch(t,states,masses,dt)
+    
+    def step(self,t,f,dt):
+        """See class Physics for full docstring
+        
+        With numba installed and an RK4 solver, the step is taken by a
+        compiled kernel.
+        """
+        if not self._compiled(slv.RK4):
+            return super().step(t,f,dt)
+        f = np.asarray(f,dtype=float)
+        fnext = np.empty_like(f)
+        f2 = f.reshape(-1,6)
+        # dt may be a scalar or hold a step for each row.
+        dts = np.empty(len(f2))
+        dts[:] = np.ravel(dt)
+        slv.rk4_central_step(t,f2,dts,self.k,fnext.reshape(-1,6))
+        return t + dt, fnext
+        
+    def diff_eq(self,t,f,out=None):
+        """See class Physics for full docstring, Computes diff eq for 6 eq.
+        
+        f may be a single state of 6 floats or a (N,6) array holding one
+        state per row, in which case all rows are computed at once. The
+        result is written to out if given, otherwise to a new array.
+        """
+        if np.ndim(f) == 1:
+            # A single state, as Physics.advance passes. Scalar arithmetic
+            # on its six elements is much faster than array operations.
+            rx, ry, rz, vx, vy, vz = f.tolist()
+            r2 = rx*rx+ry*ry+rz*rz
+            # NumPy gives inf at r = 0 where 1.0/0.0 would raise.
+            inv_r = 1.0/math.sqrt(r2) if r2 else np.inf
+            kinv = self.neg_k*inv_r*inv_r*inv_r
+            dfdt = (vx,vy,vz,kinv*rx,kinv*ry,kinv*rz)
+            if out is None:
+                return np.array(dfdt)
+            out[:] = dfdt
+            return out
+        
+        if out is None:
+            out = np.empty(np.shape(f))
+            
+        # Radius vector to -3/2 power (denom of each diff eq), from a square
+        # root and multiplies rather than a general power.
+        r2 = f[...,0]*f[...,0]+f[...,1]*f[...,1]+f[...,2]*f[...,2]
+        inv_r = 1.0/np.sqrt(r2)
+        kinv = self.neg_k*inv_r*inv_r*inv_r
         
         # Velcoties
-        drxdt = f[3]
-        drydt = f[4]
-        drzdt = f[5]
+        out[...,0:3] = f[...,3:6]
         
         # Accelerations
-        k = self.G*self.M
-        dvxdt = -(k*f[0])/rad
-        dvydt = -(k*f[1])/rad
-        dvzdt = -(k*f[2])/rad
-        
-        # Compiled np array of values.
-        dfdt = np.array([drxdt,drydt,drzdt,dvxdt,dvydt,dvzdt])
-        return dfdt
+        np.multiply(f[...,0:3],kinv[...,None],out=out[...,3:6])
+        return out
+    
+    def max_step(self,f):
+        """See class Physics for full docstring, Substeps proportional to r/v,
+        never longer than dt_max.
+        """
+        if np.ndim(f) == 1:
+            # A single state, as Physics.advance passes, in scalar
+            # arithmetic. At rest h is inf as in NumPy, or NaN if r is 0 too.
+            rx, ry, rz, vx, vy, vz = f.tolist()
+            r = math.sqrt(rx*rx+ry*ry+rz*rz)
+            v = math.sqrt(vx*vx+vy*vy+vz*vz)
+            h = self.eta*r/v if v else (math.inf if r else math.nan)
+            # min() would drop a NaN, which has to reach advance.
+            return self.dt_max if h > self.dt_max else h
+        r = np.sqrt(f[...,0]*f[...,0]+f[...,1]*f[...,1]+f[...,2]*f[...,2])
+        v = np.sqrt(f[...,3]*f[...,3]+f[...,4]*f[...,4]+f[...,5]*f[...,5])
+        # A body at rest gets inf, which becomes dt_max.
+        with np.errstate(divide='ignore',invalid='ignore'):
+            return np.minimum(self.dt_max,self.eta*r/v)
         
 class UniformGravity(Physics):
     """Implements constant gravity.
@@ -178,7 +375,7 @@ class UniformGravity(Physics):
         # I am who i am.
         self.solver.physics = self
         
-    def diff_eq(self,t,f):
+    def diff_eq(self,t,f,out=None):
         """See class Physics for full docstring"""
         drdt = f[1]
         dvdt = self.g
@@ -208,7 +405,7 @@ class LogisticPopGrowth(Physics):
         # I am who i am.
         self.solver.physics = self
         
-    def diff_eq(self,t,P):
+    def diff_eq(self,t,P,out=None):
         """See class Physics for full docstring"""
         r = self.r
         N = self.N
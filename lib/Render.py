@@ -7,7 +7,6 @@ Render the scene.
 
 @author: Ben Frey
 """
-import numpy as np
 import pygame as pg
 
 class Render(object):
@@ -25,31 +24,32 @@ class Render(object):
     None.
     """
     def __init__(self,scale,offset):
-        self.scale = scale
-        self.offset = offset
+        self.scale = tuple(scale)
+        self.offset = tuple(offset)
         
     def draw(self,model,screen):
         """Draw the animation to screen. To be implemented below"""
         print("Should never be printed")
         # Needs to be implemented in RenderSolarSystem
     
-    def coord_transform(self,coords):
+    def coord_transform(self,x,y):
         """Transformation of each coordinate to match the new scale and
         origin provided by offset.
 
         Parameters
         ----------
-        coords : 1x2 float array
-            Coordinate of body in model.
+        x : float
+            x coordinate of body in model.
+        y : float
+            y coordinate of body in model.
 
         Returns
         -------
-        Float array
+        Tuple of floats
             New adjusted corrdinate of body in a model.
         """
-        transform = np.array([[self.scale[0],0],[0,-1*self.scale[1]]])
-        origin = self.offset
-        return np.matmul(transform, coords) + origin
+        return (x*self.scale[0] + self.offset[0],
+                -y*self.scale[1] + self.offset[1])
     
 class RenderSolarSystem(Render):
     """Child of render, meant for a SolarSystem.
@@ -95,11 +95,11 @@ class RenderSolarSystem(Render):
         
         # Draw each body in model.
         for i in range(len(model.bodies)):
-            x = model.bodies[i].x
-            y = model.bodies[i].y
-            pos = self.coord_transform([x, y])
+            b = model.bodies[i]
+            pos = self.coord_transform(b.x, b.y)
             # Draw new body position (note pos need to be ints)
-            pg.draw.circle(screen,self.colors[i],pos.astype(int),self.sizes[i])
+            pg.draw.circle(screen,self.colors[i],(int(pos[0]),int(pos[1])),
+                           self.sizes[i])
 
             
         
@@ -3,9 +3,150 @@
 The Solver base class and its children
 This set of classes implements various differential equation solving 
 algorithms.  They are intended for use with the classes derived from Physics.
+
+If numba is installed, compiled kernels for RK4 steps and whole Leapfrog
+advances of central gravity are provided as well. CentralGravity uses them
+in place of the general NumPy implementation.
 """
+import math
 import numpy as np
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    
+    def njit(*args,**kwargs):
+        """Stand in for numba.njit, leaves the function uncompiled."""
+        return lambda func: func
+
+# Only the fastmath flags that leave NaN and inf alone (nnan and ninf
+# assume them away, nsz with reassoc does too), and numpy's error model so
+# dividing by zero gives inf, so the kernels fail the way the NumPy path
+# does.
+_JIT_OPTIONS = dict(cache=True,error_model='numpy',
+                    fastmath={'contract','afn','arcp'})
+
+@njit(**_JIT_OPTIONS)
+def _central_accel(rx,ry,rz,k):
+    """Acceleration towards the origin for the central gravity parameter k"""
+    inv_r = 1.0/math.sqrt(rx*rx+ry*ry+rz*rz)
+    a = -k*inv_r*inv_r*inv_r
+    return a*rx, a*ry, a*rz
+
+@njit(**_JIT_OPTIONS)
+def rk4_central_step(x,f,dx,k,fnext):
+    """Advance every row of f one RK4 step under central gravity.
+    
+    The six equations of CentralGravity.diff_eq and the four RK4 stages are
+    unrolled into scalar arithmetic.
+
+    Parameters
+    ----------
+    x : float
+        The independent variable (unused, the equations are autonomous)
+    f : (N,6) float array
+        Position and velocity of each body, one body per row
+    dx : (N,) float array
+        The stepsize of each row
+    k : float
+        Gravity parameter G*M of the central mass
+    fnext : (N,6) float array
+        Output array, receives the state of each body after the step
+
+    Returns
+    -------
+    None.
+    """
+    for i in range(f.shape[0]):
+        h = dx[i]
+        half = 0.5*h
+        sixth = h/6.0
+        rx, ry, rz = f[i,0], f[i,1], f[i,2]
+        vx, vy, vz = f[i,3], f[i,4], f[i,5]
+        
+        ax1, ay1, az1 = _central_accel(rx,ry,rz,k)
+        
+        vx2, vy2, vz2 = vx+half*ax1, vy+half*ay1, vz+half*az1
+        ax2, ay2, az2 = _central_accel(rx+half*vx,ry+half*vy,rz+half*vz,k)
+        
+        vx3, vy3, vz3 = vx+half*ax2, vy+half*ay2, vz+half*az2
+        ax3, ay3, az3 = _central_accel(rx+half*vx2,ry+half*vy2,rz+half*vz2,k)
+        
+        vx4, vy4, vz4 = vx+h*ax3, vy+h*ay3, vz+h*az3
+        ax4, ay4, az4 = _central_accel(rx+h*vx3,ry+h*vy3,rz+h*vz3,k)
+        
+        fnext[i,0] = rx + sixth*(vx+2*vx2+2*vx3+vx4)
+        fnext[i,1] = ry + sixth*(vy+2*vy2+2*vy3+vy4)
+        fnext[i,2] = rz + sixth*(vz+2*vz2+2*vz3+vz4)
+        fnext[i,3] = vx + sixth*(ax1+2*ax2+2*ax3+ax4)
+        fnext[i,4] = vy + sixth*(ay1+2*ay2+2*ay3+ay4)
+        fnext[i,5] = vz + sixth*(az1+2*az2+2*az3+az4)
+
+@njit(**_JIT_OPTIONS)
+def leapfrog_central_advance(f,k,dt,eta,dt_max,dt_min):
+    """Advance every row of f by dt under central gravity with leapfrog.
+    
+    This is the whole substep loop of Physics.advance_batch for a Leapfrog
+    solver and CentralGravity, run in one call. Every body takes its own
+    substeps of eta*r/v, kept between dt_min and dt_max as advance_batch
+    does, the last one shortened to end exactly at dt.
+
+    Parameters
+    ----------
+    f : (N,6) float array
+        Position and velocity of each body, one body per row. Updated in
+        place.
+    k : float
+        Gravity parameter G*M of the central mass
+    dt : float
+        The amount of time to advance
+    eta : float
+        Substep size relative to r/v
+    dt_max : float
+        Longest substep
+    dt_min : float
+        Shortest substep
+
+    Returns
+    -------
+    None.
+    
+    Raises
+    ------
+    ValueError
+        If dt or a state is not finite, as advance_batch does.
+    """
+    if not math.isfinite(dt):
+        raise ValueError("dt is not finite")
+    for i in range(f.shape[0]):
+        rx, ry, rz = f[i,0], f[i,1], f[i,2]
+        vx, vy, vz = f[i,3], f[i,4], f[i,5]
+        ax, ay, az = _central_accel(rx,ry,rz,k)
+        remaining = dt
+        while remaining != 0.0:
+            h = eta*math.sqrt((rx*rx+ry*ry+rz*rz)/(vx*vx+vy*vy+vz*vz))
+            if math.isnan(h):
+                raise ValueError("state is not finite")
+            if h > dt_max:
+                h = dt_max
+            if h < dt_min:
+                h = dt_min
+            if abs(remaining) <= h:
+                h = remaining
+            elif remaining < 0.0:
+                h = -h
+            
+            vx, vy, vz = vx+0.5*h*ax, vy+0.5*h*ay, vz+0.5*h*az
+            rx, ry, rz = rx+h*vx, ry+h*vy, rz+h*vz
+            ax, ay, az = _central_accel(rx,ry,rz,k)
+            vx, vy, vz = vx+0.5*h*ax, vy+0.5*h*ay, vz+0.5*h*az
+            remaining -= h
+            
+        f[i,0], f[i,1], f[i,2] = rx, ry, rz
+        f[i,3], f[i,4], f[i,5] = vx, vy, vz
+
 class Solver(object):
     """Differential equation solver base class.
     
@@ -75,7 +216,25 @@ class RK2(Solver):
         return xnext, fnext
     
 class RK4(Solver):
-    """Runge-Kutta 4th order technique for differential equation solving"""
+    """Runge-Kutta 4th order technique for differential equation solving
+    
+    The intermediate states handed to the differential equation and the
+    four slopes it returns are kept in scratch arrays on the instance, so a
+    step does not allocate a new array for each of them.
+    """
+    
+    def __init__(self,physics=None):
+        super().__init__(physics)
+        self._scratch_buf = None
+        
+    def _scratch(self,f):
+        """Returns the scratch array for the intermediate states and one
+        for each of k1..k4, reallocated only if f changes shape."""
+        shape = (5,)+np.shape(f)
+        if self._scratch_buf is None or self._scratch_buf.shape != shape:
+            self._scratch_buf = np.empty(shape)
+        # Index with ... so that scalar states still get 0-d arrays.
+        return [self._scratch_buf[i,...] for i in range(5)]
     
     def advance(self,x,f,dx):
         """See class Solver for full docstring
@@ -86,22 +245,73 @@ class RK4(Solver):
         k4 = G(Xn+dx,f(Xn)+k3)*dx
         f(Xn+1) = f(Xn) + (1/6)(k1+2k2+2k3+k4)
         """
-        # Uh oh, this doesn't seem very modular...
-        mass = f[6]
-        f=f[:6]
+        tmp, k1, k2, k3, k4 = self._scratch(f)
+        half_dx = 0.5*dx
+        sixth_dx = dx/6.0
         
         xnext = x + dx
-        k1 = self.physics.diff_eq(x, f)
-        k2 = self.physics.diff_eq(x+0.5*dx,f+0.5*k1*dx)
-        k3 = self.physics.diff_eq(x+0.5*dx,f+0.5*k2*dx)
-        k4 = self.physics.diff_eq(x+dx,f+k3*dx)
-        fnext = f + (1/6)*(k1+2*k2+2*k3+k4)*dx
+        xhalf = x + half_dx
+        # The physics may ignore out, so always use the returned slopes.
+        k1 = self.physics.diff_eq(x,f,out=k1)
+        np.multiply(k1,half_dx,out=tmp)
+        np.add(f,tmp,out=tmp)
+        k2 = self.physics.diff_eq(xhalf,tmp,out=k2)
+        np.multiply(k2,half_dx,out=tmp)
+        np.add(f,tmp,out=tmp)
+        k3 = self.physics.diff_eq(xhalf,tmp,out=k3)
+        np.multiply(k3,dx,out=tmp)
+        np.add(f,tmp,out=tmp)
+        k4 = self.physics.diff_eq(xnext,tmp,out=k4)
         
-        #print(dx)
+        # fnext = f + (1/6)*(k1+2*k2+2*k3+k4)*dx, accumulated in place.
+        fnext = np.add(k2,k3)
+        fnext *= 2
+        fnext += k1
+        fnext += k4
+        fnext *= sixth_dx
+        fnext += f
+        return xnext, fnext
+    
+class Leapfrog(Solver):
+    """Kick-drift-kick leapfrog technique for differential equation solving
+    
+    Meant for second order equations where the first half of the state is
+    the position, the second half is the velocity and the acceleration
+    depends only on the position. Being symplectic, it keeps the energy of
+    closed orbits bounded over long times.
+    
+    The acceleration at the end of a step is kept and reused at the start
+    of the next step when it continues from the returned state, so each
+    step costs a single evaluation of the differential equation.
+    """
+    
+    def __init__(self,physics=None):
+        super().__init__(physics)
+        self._flast = None
+        self._alast = None
         
-        # Or this either...
-        fnext = np.append(fnext, mass)
+    def advance(self,x,f,dx):
+        """See class Solver for full docstring
         
-        #print(xnext)
-        #print(fnext)
-        return xnext, fnext
\ No newline at end of file
+        v(Xn+1/2) = v(Xn) + a(r(Xn))*dx/2
+        r(Xn+1) = r(Xn) + v(Xn+1/2)*dx
+        v(Xn+1) = v(Xn+1/2) + a(r(Xn+1))*dx/2
+        """
+        n = np.shape(f)[-1]//2
+        if self._flast is not None and np.array_equal(f,self._flast):
+            a = self._alast
+        else:
+            a = self.physics.diff_eq(x,f)[...,n:]
+        
+        xnext = x + dx
+        fnext = np.array(f,dtype=float)
+        r = fnext[...,:n]
+        v = fnext[...,n:]
+        v += 0.5*dx*a
+        r += dx*v
+        anext = self.physics.diff_eq(xnext,fnext)[...,n:]
+        v += 0.5*dx*anext
+        
+        self._flast = fnext.copy()
+        self._alast = anext
+        return xnext, fnext
@@ -7,6 +7,7 @@ Creates a class that allows us to manipulate vectors.
 
 @author: Ben Frey
 """
+import math
 import numpy
 
 def main():
@@ -37,6 +38,7 @@ class Vector():
     theta : float
         Theta of vector
     """
+    __slots__ = ('x','y')
     
     def __init__(self, x, y):
         self.x = x
@@ -45,7 +47,7 @@ class Vector():
     @property
     def r(self):
         """Returns the magnitude of the vector"""
-        return numpy.sqrt(numpy.square(self.x)+numpy.square(self.y))
+        return math.sqrt(self.x*self.x+self.y*self.y)
 
     @r.setter
     def r(self,val):